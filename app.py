@@ -8,14 +8,14 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import os
 
-from server.db import db
+from server.repository import repository
 from server.routes.batches import router as batches_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     yield
-    await db.close()
+    await repository.close()
 
 
 app = FastAPI(title="Stelara Batch Release Dashboard", lifespan=lifespan)
@@ -0,0 +1,209 @@
+"""
+Check that the API's queries keep using indexes and stay within cost budgets.
+
+Loads a large synthetic batch_disposition dataset into a scratch Postgres
+database, applies db_setup/migrations, then runs EXPLAIN (FORMAT JSON) on every
+query in server/queries.py. Exits non-zero on any plan regression so it can gate
+a build.
+
+Cost budgets are expressed as a ratio of a full sequential scan of the table,
+so they hold regardless of --rows or the server's cost settings.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import psycopg2
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from migrate import apply_migrations  # noqa: E402
+from server import queries  # noqa: E402
+
+PKEY = "batch_disposition_pkey"
+STATUS_INDEX = "idx_batch_disposition_status_last_updated"
+EXCEPTIONS_INDEX = "idx_batch_disposition_exceptions"
+
+# Mirrors a long-running site: almost everything historical is released, the
+# pending backlog is the most recent handful, and few batches have exceptions.
+SYNTHETIC_ROWS_SQL = """
+INSERT INTO batch_disposition
+(batch_id, drug_name, batch_name, status, temp_actual, temp_check, purity_actual, purity_check,
+ manufactured_date, expiry_date, cycle_time_hours, last_updated, exceptions, signed_by)
+SELECT
+    'BD-' || LPAD(g::text, 9, '0'),
+    CASE WHEN g %% 5 = 0 THEN 'Tremfya' ELSE 'Stelara' END,
+    'STL-' || LPAD(g::text, 9, '0'),
+    CASE
+        WHEN g > %(rows)s - %(rows)s / 200 THEN 'Pending'
+        WHEN s < 0.015 THEN 'Rejected'
+        ELSE 'Released'
+    END,
+    CASE WHEN t < 0.02 THEN 37.6 + t * 40 ELSE 36.8 + t * 0.4 END,
+    t >= 0.02,
+    CASE WHEN p < 0.01 THEN 95.0 + p * 200 ELSE 98.0 + p * 1.9 END,
+    p >= 0.01,
+    DATE '2020-01-01' + (g * 2190 / %(rows)s),
+    DATE '2022-01-01' + (g * 2190 / %(rows)s),
+    40 + random() * 40,
+    TIMESTAMP '2020-01-01' + g * INTERVAL '5 minutes',
+    CASE
+        WHEN t < 0.02 THEN 'Temperature excursion'
+        WHEN p < 0.01 THEN 'Purity below threshold'
+    END,
+    CASE WHEN g <= %(rows)s - %(rows)s / 200 THEN 'QA Reviewer' END
+FROM (
+    SELECT g, random() AS s, random() AS t, random() AS p
+    FROM generate_series(1, %(rows)s) AS g
+) AS synthetic
+"""
+
+
+class PlanCheck(NamedTuple):
+    name: str
+    sql: str
+    args: tuple = ()
+    index: Optional[str] = None
+    max_cost_ratio: float = 1.0
+
+
+def plan_checks() -> list[PlanCheck]:
+    list_sql, _ = queries.build_batches_query()
+    status_sql, status_args = queries.build_batches_query(status="Pending")
+    search_sql, search_args = queries.build_batches_query(search="STL-0001")
+    return [
+        PlanCheck("batch_by_id", queries.BATCH_BY_ID, ("BD-000000401",), PKEY, 0.01),
+        PlanCheck("release_batch", queries.RELEASE_BATCH, ("BD-000000401", "QA Reviewer"), PKEY, 0.01),
+        PlanCheck("reject_batch", queries.REJECT_BATCH, ("BD-000000401",), PKEY, 0.01),
+        PlanCheck("batches_by_status", status_sql, tuple(status_args), STATUS_INDEX, 0.75),
+        PlanCheck("pending_count", queries.PENDING_COUNT, (), STATUS_INDEX, 0.25),
+        PlanCheck("rejected_count", queries.REJECTED_COUNT, (), STATUS_INDEX, 0.25),
+        # Released is most of the table, so a sequential scan is the right plan;
+        # the ceiling only catches it getting worse than one.
+        PlanCheck("released_count", queries.RELEASED_COUNT, (), None, 1.25),
+        PlanCheck("exception_count", queries.EXCEPTION_COUNT, (), EXCEPTIONS_INDEX, 0.25),
+        PlanCheck("temp_fail_count", queries.TEMP_FAIL_COUNT, (), EXCEPTIONS_INDEX, 0.25),
+        PlanCheck("purity_fail_count", queries.PURITY_FAIL_COUNT, (), EXCEPTIONS_INDEX, 0.25),
+        PlanCheck("quality_events", queries.QUALITY_EVENTS, (), EXCEPTIONS_INDEX, 0.75),
+        # Whole-table reads: no index requirement, only a ceiling that catches
+        # e.g. losing the last_updated index and falling back to a full sort.
+        PlanCheck("batches_all", list_sql, (), None, 2.5),
+        PlanCheck("batches_search", search_sql, tuple(search_args), None, 4.0),
+        PlanCheck("total_count", queries.TOTAL_COUNT, (), None, 1.5),
+        PlanCheck("avg_cycle_time", queries.AVG_CYCLE_TIME, (), None, 2.0),
+        PlanCheck("status_breakdown", queries.STATUS_BREAKDOWN, (), None, 2.0),
+        PlanCheck("cycle_time_by_status", queries.CYCLE_TIME_BY_STATUS, (), None, 2.0),
+        PlanCheck("monthly_trend", queries.MONTHLY_TREND, (), None, 3.0),
+    ]
+
+
+def explain(cur, name: str, sql: str, args: tuple) -> dict:
+    """EXPLAIN a $n-parameterized statement exactly as asyncpg would send it."""
+    cur.execute(f"PREPARE {name} AS {sql}")
+    try:
+        if args:
+            placeholders = ", ".join(["%s"] * len(args))
+            cur.execute(f"EXPLAIN (FORMAT JSON) EXECUTE {name}({placeholders})", args)
+        else:
+            cur.execute(f"EXPLAIN (FORMAT JSON) EXECUTE {name}")
+        return cur.fetchone()[0][0]["Plan"]
+    finally:
+        cur.execute(f"DEALLOCATE {name}")
+
+
+def indexes_used(plan: dict) -> set[str]:
+    found = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        found |= indexes_used(child)
+    return found
+
+
+def ensure_database(host: str, port: int, user: str, password: str, db_name: str) -> None:
+    conn = psycopg2.connect(host=host, port=port, dbname="postgres", user=user, password=password)
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
+    if not cur.fetchone():
+        cur.execute(f'CREATE DATABASE "{db_name}"')
+        print(f"Created database {db_name}")
+    cur.close()
+    conn.close()
+
+
+def load_synthetic_data(cur, rows: int) -> None:
+    print(f"Loading {rows} synthetic batches...")
+    cur.execute("TRUNCATE batch_disposition")
+    cur.execute(SYNTHETIC_ROWS_SQL, {"rows": rows})
+    # Refresh statistics and the visibility map so index-only scans are costed realistically.
+    cur.execute("VACUUM ANALYZE batch_disposition")
+
+
+def run_checks(cur) -> list[str]:
+    baseline = explain(cur, "plan_baseline", "SELECT * FROM batch_disposition", ())["Total Cost"]
+    print(f"Sequential scan baseline cost: {baseline:.1f}")
+
+    failures = []
+    for check in plan_checks():
+        plan = explain(cur, f"plan_{check.name}", check.sql, check.args)
+        cost = plan["Total Cost"]
+        ratio = cost / baseline
+        used = indexes_used(plan)
+        problems = []
+        if check.index and check.index not in used:
+            problems.append(f"expected index {check.index}, plan used {sorted(used) or 'no index'}")
+        if ratio > check.max_cost_ratio:
+            problems.append(f"cost ratio {ratio:.3f} exceeds budget {check.max_cost_ratio}")
+        status = "FAIL" if problems else "OK"
+        print(f"  {status:<4} {check.name:<22} cost={cost:>10.1f} ratio={ratio:.3f} top={plan['Node Type']}")
+        failures.extend(f"{check.name}: {problem}" for problem in problems)
+    return failures
+
+
+def check_plans(host: str, port: int, user: str, password: str, db_name: str, rows: int) -> list[str]:
+    """Migrate and load a scratch database, then return one message per plan regression."""
+    if db_name == "batch_release_db":
+        raise RuntimeError("Refusing to load synthetic data into batch_release_db; use a scratch database")
+
+    ensure_database(host, port, user, password, db_name)
+    conn = psycopg2.connect(host=host, port=port, dbname=db_name, user=user, password=password)
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        print("Applying migrations...")
+        apply_migrations(conn)
+        load_synthetic_data(cur, rows)
+        return run_checks(cur)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def main() -> None:
+    # PLAN_CHECK_* rather than PG* so a shell with Lakebase settings exported
+    # never gets a synthetic database created on it.
+    parser = argparse.ArgumentParser(description="Fail on query plan regressions against a scratch Postgres.")
+    parser.add_argument("--host", default=os.environ.get("PLAN_CHECK_HOST", "localhost"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PLAN_CHECK_PORT", "5432")))
+    parser.add_argument("--user", default=os.environ.get("PLAN_CHECK_USER", "postgres"))
+    parser.add_argument("--password", default=os.environ.get("PLAN_CHECK_PASSWORD", ""))
+    parser.add_argument("--db-name", default="batch_plan_check")
+    parser.add_argument("--rows", type=int, default=int(os.environ.get("PLAN_CHECK_ROWS", "200000")))
+    args = parser.parse_args()
+
+    failures = check_plans(args.host, args.port, args.user, args.password, args.db_name, args.rows)
+    if failures:
+        print("")
+        print("Query plan regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        raise SystemExit(1)
+    print("All query plans within budget.")
+
+
+if __name__ == "__main__":
+    main()
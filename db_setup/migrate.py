@@ -0,0 +1,159 @@
+"""Apply versioned schema/index migrations from db_setup/migrations to Lakebase."""
+
+import argparse
+import json
+import subprocess
+from pathlib import Path
+
+import psycopg2
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+# Arbitrary constant key guarding against two runners applying migrations at once.
+# Taken with pg_try_advisory_lock: a runner blocked in pg_advisory_lock holds a
+# snapshot that CREATE INDEX CONCURRENTLY in the lock holder waits on, which deadlocks.
+MIGRATION_LOCK_KEY = 72110426
+
+
+def cli_json(args: list[str], profile: str) -> dict | list:
+    result = subprocess.run(
+        ["databricks"] + args + ["--profile", profile, "--output", "json"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def load_migrations() -> list[tuple[int, str, str]]:
+    """Return (version, name, sql) for every NNNN_name.sql file, ordered by version."""
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        version, _, name = path.stem.partition("_")
+        migrations.append((int(version), name, path.read_text()))
+    versions = [m[0] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+    return migrations
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split a migration file into statements (no semicolons inside literals)."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def applied_versions(cur) -> set[int]:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def invalid_indexes(cur) -> list[str]:
+    """Indexes left INVALID by an interrupted CREATE INDEX CONCURRENTLY."""
+    cur.execute(
+        """
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE NOT i.indisvalid AND n.nspname = current_schema()
+        """
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def apply_migrations(conn, dry_run: bool = False) -> list[int]:
+    """
+    Apply pending migrations in version order and return the versions applied.
+
+    The connection must be in autocommit mode: CREATE INDEX CONCURRENTLY cannot
+    run inside a transaction block, so each statement commits on its own and a
+    version is recorded only after all of its statements succeed.
+    """
+    if not conn.autocommit:
+        raise RuntimeError("apply_migrations requires an autocommit connection")
+
+    cur = conn.cursor()
+    cur.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+    if not cur.fetchone()[0]:
+        cur.close()
+        raise RuntimeError("Another migration is running; re-run once it has finished")
+    try:
+        done = applied_versions(cur)
+        pending = [m for m in load_migrations() if m[0] not in done]
+        for version, name, sql in pending:
+            print(f"  {'Pending' if dry_run else 'Applying'} migration {version:04d}_{name}")
+            if dry_run:
+                continue
+            for statement in split_statements(sql):
+                cur.execute(statement)
+            broken = invalid_indexes(cur)
+            if broken:
+                # IF NOT EXISTS would silently keep these, so stop and make the operator drop them.
+                raise RuntimeError(
+                    f"Migration {version:04d}_{name} left invalid indexes {broken}; "
+                    "DROP INDEX CONCURRENTLY them and re-run"
+                )
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                (version, name),
+            )
+        if not pending:
+            print("  Schema is up to date.")
+        return [m[0] for m in pending]
+    finally:
+        cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+        cur.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply schema/index migrations to Lakebase.")
+    parser.add_argument("--profile", default="DEFAULT")
+    parser.add_argument("--project", default="batch-release")
+    parser.add_argument("--db-name", default="batch_release_db")
+    parser.add_argument("--branch", default="production")
+    parser.add_argument("--endpoint", default="primary")
+    parser.add_argument("--dry-run", action="store_true", help="List pending migrations without applying them")
+    args = parser.parse_args()
+
+    endpoints = cli_json(
+        ["postgres", "list-endpoints", f"projects/{args.project}/branches/{args.branch}"],
+        args.profile,
+    )
+    host = endpoints[0]["status"]["hosts"]["host"]
+    cred = cli_json(
+        [
+            "postgres",
+            "generate-database-credential",
+            f"projects/{args.project}/branches/{args.branch}/endpoints/{args.endpoint}",
+        ],
+        args.profile,
+    )
+    user = cli_json(["current-user", "me"], args.profile)["userName"]
+
+    conn = psycopg2.connect(
+        host=host,
+        port=5432,
+        dbname=args.db_name,
+        user=user,
+        password=cred["token"],
+        sslmode="require",
+    )
+    conn.autocommit = True
+    print(f"Migrating {args.db_name}...")
+    apply_migrations(conn, dry_run=args.dry_run)
+    conn.close()
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
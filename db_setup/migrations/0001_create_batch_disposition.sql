@@ -0,0 +1,18 @@
+-- Baseline schema. Matches the table previously created inline by seed_db.py,
+-- so existing databases record this version without any change.
+CREATE TABLE IF NOT EXISTS batch_disposition (
+    batch_id TEXT PRIMARY KEY,
+    drug_name TEXT NOT NULL,
+    batch_name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    temp_actual FLOAT NOT NULL,
+    temp_check BOOLEAN NOT NULL,
+    purity_actual FLOAT NOT NULL,
+    purity_check BOOLEAN NOT NULL,
+    manufactured_date DATE NOT NULL,
+    expiry_date DATE NOT NULL,
+    cycle_time_hours FLOAT NOT NULL,
+    last_updated TIMESTAMP NOT NULL DEFAULT NOW(),
+    exceptions TEXT,
+    signed_by TEXT
+);
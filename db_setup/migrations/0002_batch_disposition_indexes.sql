@@ -0,0 +1,18 @@
+-- Supporting indexes for server/routes/batches.py.
+-- Built CONCURRENTLY so they can be applied to a live database without
+-- blocking writes; the runner executes each statement outside a transaction.
+
+-- /api/batches?status=...: status filter with newest-first ordering.
+-- Also serves COUNT(*) for the small Pending/Rejected buckets as index-only scans.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_batch_disposition_status_last_updated
+    ON batch_disposition (status, last_updated DESC);
+
+-- /api/batches without a status filter: newest-first ordering.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_batch_disposition_last_updated
+    ON batch_disposition (last_updated DESC);
+
+-- /api/quality-events and exception counts: only the batches with a failed check.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_batch_disposition_exceptions
+    ON batch_disposition (last_updated DESC)
+    INCLUDE (temp_check, purity_check)
+    WHERE temp_check = false OR purity_check = false;
@@ -0,0 +1,241 @@
+"""In-process columnar batch store for offline development, tests and benchmarks."""
+
+import re
+from array import array
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Iterable, Optional
+from .repository import BatchRepository
+
+COLUMNS = (
+    "batch_id",
+    "drug_name",
+    "batch_name",
+    "status",
+    "temp_actual",
+    "temp_check",
+    "purity_actual",
+    "purity_check",
+    "manufactured_date",
+    "expiry_date",
+    "cycle_time_hours",
+    "last_updated",
+    "exceptions",
+    "signed_by",
+)
+
+QUALITY_EVENT_COLUMNS = (
+    "batch_id",
+    "drug_name",
+    "batch_name",
+    "status",
+    "temp_actual",
+    "temp_check",
+    "purity_actual",
+    "purity_check",
+    "cycle_time_hours",
+    "last_updated",
+    "exceptions",
+)
+
+_FLOAT_COLUMNS = ("temp_actual", "purity_actual", "cycle_time_hours")
+_BOOL_COLUMNS = ("temp_check", "purity_check")
+
+
+def _ilike(pattern: str) -> re.Pattern:
+    """Compile a Postgres ILIKE pattern: % and _ are wildcards, backslash escapes."""
+    parts = []
+    chars = iter(pattern)
+    for char in chars:
+        if char == "\\":
+            parts.append(re.escape(next(chars, "\\")))
+        elif char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def _round1(value: float) -> Decimal:
+    """Match Postgres ROUND(x::numeric, 1): 15 significant digits, half away from zero."""
+    return Decimal(f"{value:.15g}").quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
+
+
+class MemoryBatchRepository(BatchRepository):
+    """
+    Keeps batches in per-column arrays instead of row objects.
+
+    Numeric and boolean columns are typed arrays; text and temporal columns
+    are lists. Secondary indexes mirror db_setup/migrations: batch_id -> row,
+    status -> rows, manufactured month -> rows, and the rows with a failed
+    check. Rows are never deleted, so row positions are stable.
+    """
+
+    def __init__(self, rows: Iterable[dict] = ()):
+        self._text: dict[str, list] = {
+            name: [] for name in COLUMNS if name not in _FLOAT_COLUMNS + _BOOL_COLUMNS
+        }
+        self._floats: dict[str, array] = {name: array("d") for name in _FLOAT_COLUMNS}
+        self._bools: dict[str, array] = {name: array("b") for name in _BOOL_COLUMNS}
+        self._by_id: dict[str, int] = {}
+        self._by_status: dict[str, set[int]] = {}
+        self._by_month: dict[str, list[int]] = {}
+        self._exceptions: set[int] = set()
+        self._newest_first: Optional[list[int]] = None
+        for row in rows:
+            self.add_batch(row)
+
+    def add_batch(self, row: dict) -> None:
+        """Insert one batch, applying the same defaults as the table definition."""
+        batch_id = row["batch_id"]
+        if batch_id in self._by_id:
+            raise ValueError(f"Duplicate batch_id {batch_id}")
+        values = {"status": "Pending", "last_updated": datetime.now(), "exceptions": None, "signed_by": None}
+        values.update(row)
+
+        idx = len(self._text["batch_id"])
+        for name, column in self._text.items():
+            column.append(values[name])
+        for name, column in self._floats.items():
+            column.append(float(values[name]))
+        for name, column in self._bools.items():
+            column.append(bool(values[name]))
+
+        self._by_id[batch_id] = idx
+        self._by_status.setdefault(values["status"], set()).add(idx)
+        self._by_month.setdefault(self._month(values["manufactured_date"]), []).append(idx)
+        if not values["temp_check"] or not values["purity_check"]:
+            self._exceptions.add(idx)
+        self._newest_first = None
+
+    @staticmethod
+    def _month(value: date) -> str:
+        return value.strftime("%Y-%m")
+
+    def _row(self, idx: int, columns: tuple = COLUMNS) -> dict:
+        row = {}
+        for name in columns:
+            if name in self._floats:
+                row[name] = self._floats[name][idx]
+            elif name in self._bools:
+                row[name] = bool(self._bools[name][idx])
+            else:
+                row[name] = self._text[name][idx]
+        return row
+
+    def _newest_first_all(self) -> list[int]:
+        """Every row newest first; cached and kept current by _set_status."""
+        if self._newest_first is None:
+            last_updated = self._text["last_updated"]
+            self._newest_first = sorted(range(len(last_updated)), key=last_updated.__getitem__, reverse=True)
+        return self._newest_first
+
+    def _ordered(self, rows: Iterable[int]) -> list[int]:
+        """A subset of rows sorted newest first, costing O(k log k) in its own size."""
+        return sorted(rows, key=self._text["last_updated"].__getitem__, reverse=True)
+
+    def _set_status(self, idx: int, status: str) -> None:
+        self._by_status[self._text["status"][idx]].discard(idx)
+        self._by_status.setdefault(status, set()).add(idx)
+        self._text["status"][idx] = status
+        self._text["last_updated"][idx] = datetime.now()
+        if self._newest_first is not None:
+            # NOW() is the newest timestamp in the table, so only this row moves.
+            self._newest_first.remove(idx)
+            self._newest_first.insert(0, idx)
+
+    async def list_batches(self, search: Optional[str] = None, status: Optional[str] = None) -> list[dict]:
+        if status and status != "All":
+            candidates = self._by_status.get(status, set())
+        elif not search:
+            return [self._row(idx) for idx in self._newest_first_all()]
+        else:
+            candidates = range(len(self._text["batch_id"]))
+        if search:
+            # Same pattern queries.build_batches_query binds to ILIKE.
+            matches = _ilike(f"%{search}%").fullmatch
+            batch_ids = self._text["batch_id"]
+            drug_names = self._text["drug_name"]
+            candidates = {
+                idx for idx in candidates
+                if matches(batch_ids[idx]) or matches(drug_names[idx])
+            }
+        return [self._row(idx) for idx in self._ordered(candidates)]
+
+    async def get_batch(self, batch_id: str) -> Optional[dict]:
+        idx = self._by_id.get(batch_id)
+        return None if idx is None else self._row(idx)
+
+    async def count_batches(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return len(self._by_id)
+        return len(self._by_status.get(status, ()))
+
+    async def avg_cycle_time(self) -> Any:
+        cycle = self._floats["cycle_time_hours"]
+        return _round1(sum(cycle) / len(cycle)) if cycle else None
+
+    async def count_exceptions(self) -> int:
+        return len(self._exceptions)
+
+    async def count_temp_failures(self) -> int:
+        temp_check = self._bools["temp_check"]
+        return sum(1 for idx in self._exceptions if not temp_check[idx])
+
+    async def count_purity_failures(self) -> int:
+        purity_check = self._bools["purity_check"]
+        return sum(1 for idx in self._exceptions if not purity_check[idx])
+
+    async def release_batch(self, batch_id: str, signed_by: str) -> None:
+        idx = self._by_id.get(batch_id)
+        if idx is None:
+            return
+        self._set_status(idx, "Released")
+        self._text["signed_by"][idx] = signed_by
+
+    async def reject_batch(self, batch_id: str) -> None:
+        idx = self._by_id.get(batch_id)
+        if idx is None or self._text["status"][idx] != "Pending":
+            return
+        self._set_status(idx, "Rejected")
+
+    async def quality_events(self) -> list[dict]:
+        return [self._row(idx, QUALITY_EVENT_COLUMNS) for idx in self._ordered(self._exceptions)]
+
+    async def status_breakdown(self) -> list[dict]:
+        return [
+            {"status": status, "count": len(rows)}
+            for status, rows in sorted(self._by_status.items())
+            if rows
+        ]
+
+    async def monthly_trend(self) -> list[dict]:
+        statuses = self._text["status"]
+        trend = []
+        for month, rows in sorted(self._by_month.items()):
+            month_statuses = [statuses[idx] for idx in rows]
+            trend.append({
+                "month": month,
+                "total": len(rows),
+                "released": month_statuses.count("Released"),
+                "pending": month_statuses.count("Pending"),
+                "rejected": month_statuses.count("Rejected"),
+            })
+        return trend
+
+    async def cycle_time_by_status(self) -> list[dict]:
+        cycle = self._floats["cycle_time_hours"]
+        result = []
+        for status, rows in sorted(self._by_status.items()):
+            if not rows:
+                continue
+            values = [cycle[idx] for idx in rows]
+            result.append({
+                "status": status,
+                "avg_cycle": _round1(sum(values) / len(values)),
+                "min_cycle": _round1(min(values)),
+                "max_cycle": _round1(max(values)),
+            })
+        return result
@@ -0,0 +1,74 @@
+"""SQL issued by PostgresBatchRepository for the batch routes.
+
+Kept in one place so db_setup/check_query_plans.py can EXPLAIN exactly what
+the API runs against the indexes created by db_setup/migrations.
+"""
+
+from typing import Optional
+
+BATCH_BY_ID = "SELECT * FROM batch_disposition WHERE batch_id = $1"
+
+PENDING_COUNT = "SELECT COUNT(*) FROM batch_disposition WHERE status = 'Pending'"
+RELEASED_COUNT = "SELECT COUNT(*) FROM batch_disposition WHERE status = 'Released'"
+REJECTED_COUNT = "SELECT COUNT(*) FROM batch_disposition WHERE status = 'Rejected'"
+TOTAL_COUNT = "SELECT COUNT(*) FROM batch_disposition"
+AVG_CYCLE_TIME = "SELECT ROUND(AVG(cycle_time_hours)::numeric, 1) FROM batch_disposition"
+EXCEPTION_COUNT = "SELECT COUNT(*) FROM batch_disposition WHERE temp_check = false OR purity_check = false"
+TEMP_FAIL_COUNT = "SELECT COUNT(*) FROM batch_disposition WHERE temp_check = false"
+PURITY_FAIL_COUNT = "SELECT COUNT(*) FROM batch_disposition WHERE purity_check = false"
+
+RELEASE_BATCH = """UPDATE batch_disposition
+           SET status = 'Released',
+               last_updated = NOW(),
+               signed_by = $2
+           WHERE batch_id = $1"""
+
+REJECT_BATCH = """UPDATE batch_disposition
+           SET status = 'Rejected', last_updated = NOW()
+           WHERE batch_id = $1 AND status = 'Pending'"""
+
+QUALITY_EVENTS = """SELECT batch_id, drug_name, batch_name, status, temp_actual, temp_check,
+                  purity_actual, purity_check, cycle_time_hours, last_updated, exceptions
+           FROM batch_disposition
+           WHERE temp_check = false OR purity_check = false
+           ORDER BY last_updated DESC"""
+
+STATUS_BREAKDOWN = "SELECT status, COUNT(*) as count FROM batch_disposition GROUP BY status ORDER BY status"
+
+MONTHLY_TREND = """SELECT TO_CHAR(manufactured_date, 'YYYY-MM') as month,
+                  COUNT(*) as total,
+                  COUNT(*) FILTER (WHERE status = 'Released') as released,
+                  COUNT(*) FILTER (WHERE status = 'Pending') as pending,
+                  COUNT(*) FILTER (WHERE status = 'Rejected') as rejected
+           FROM batch_disposition
+           GROUP BY TO_CHAR(manufactured_date, 'YYYY-MM')
+           ORDER BY month"""
+
+CYCLE_TIME_BY_STATUS = """SELECT status, ROUND(AVG(cycle_time_hours)::numeric, 1) as avg_cycle,
+                  ROUND(MIN(cycle_time_hours)::numeric, 1) as min_cycle,
+                  ROUND(MAX(cycle_time_hours)::numeric, 1) as max_cycle
+           FROM batch_disposition GROUP BY status ORDER BY status"""
+
+
+def build_batches_query(search: Optional[str] = None, status: Optional[str] = None) -> tuple[str, list]:
+    """Return (sql, args) for the filtered, newest-first batch list."""
+    query = "SELECT * FROM batch_disposition"
+    conditions = []
+    args = []
+    idx = 1
+
+    if search:
+        conditions.append(f"(batch_id ILIKE ${idx} OR drug_name ILIKE ${idx})")
+        args.append(f"%{search}%")
+        idx += 1
+
+    if status and status != "All":
+        conditions.append(f"status = ${idx}")
+        args.append(status)
+        idx += 1
+
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    query += " ORDER BY last_updated DESC"
+    return query, args
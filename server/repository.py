@@ -0,0 +1,171 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from . import queries
+from .db import DatabasePool, db
+
+
+class BatchRepository(ABC):
+    """
+    Storage for batch_disposition rows used by the API routes.
+
+    Rows are returned as plain dicts with the same keys and value types that
+    asyncpg produces for the SQL in server/queries.py, so routes and their
+    serialization behave identically whichever backend is active.
+    """
+
+    @abstractmethod
+    async def list_batches(self, search: Optional[str] = None, status: Optional[str] = None) -> list[dict]:
+        """Batches matching search/status, newest first."""
+
+    @abstractmethod
+    async def get_batch(self, batch_id: str) -> Optional[dict]:
+        """A single batch, or None if it does not exist."""
+
+    @abstractmethod
+    async def count_batches(self, status: Optional[str] = None) -> int:
+        """Number of batches, optionally restricted to one status."""
+
+    @abstractmethod
+    async def avg_cycle_time(self) -> Any:
+        """Average cycle time rounded to 1 decimal, or None with no batches."""
+
+    @abstractmethod
+    async def count_exceptions(self) -> int:
+        """Batches failing the temperature or purity check."""
+
+    @abstractmethod
+    async def count_temp_failures(self) -> int:
+        """Batches failing the temperature check."""
+
+    @abstractmethod
+    async def count_purity_failures(self) -> int:
+        """Batches failing the purity check."""
+
+    @abstractmethod
+    async def release_batch(self, batch_id: str, signed_by: str) -> None:
+        """Mark a batch Released and record who signed it off."""
+
+    @abstractmethod
+    async def reject_batch(self, batch_id: str) -> None:
+        """Mark a batch Rejected if it is still Pending."""
+
+    @abstractmethod
+    async def quality_events(self) -> list[dict]:
+        """Batches with exceptions, newest first (columns of queries.QUALITY_EVENTS)."""
+
+    @abstractmethod
+    async def status_breakdown(self) -> list[dict]:
+        """{status, count} per status, ordered by status."""
+
+    @abstractmethod
+    async def monthly_trend(self) -> list[dict]:
+        """{month, total, released, pending, rejected} per manufactured month."""
+
+    @abstractmethod
+    async def cycle_time_by_status(self) -> list[dict]:
+        """{status, avg_cycle, min_cycle, max_cycle} per status, ordered by status."""
+
+    async def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class PostgresBatchRepository(BatchRepository):
+    """Lakebase/Postgres backend running server/queries.py through asyncpg."""
+
+    def __init__(self, pool: DatabasePool = db):
+        self._db = pool
+
+    async def list_batches(self, search: Optional[str] = None, status: Optional[str] = None) -> list[dict]:
+        pool = await self._db.get_pool()
+        query, args = queries.build_batches_query(search, status)
+        rows = await pool.fetch(query, *args)
+        return [dict(r) for r in rows]
+
+    async def get_batch(self, batch_id: str) -> Optional[dict]:
+        pool = await self._db.get_pool()
+        row = await pool.fetchrow(queries.BATCH_BY_ID, batch_id)
+        return dict(row) if row else None
+
+    async def count_batches(self, status: Optional[str] = None) -> int:
+        pool = await self._db.get_pool()
+        query = {
+            None: queries.TOTAL_COUNT,
+            "Pending": queries.PENDING_COUNT,
+            "Released": queries.RELEASED_COUNT,
+            "Rejected": queries.REJECTED_COUNT,
+        }[status]
+        return await pool.fetchval(query)
+
+    async def avg_cycle_time(self) -> Any:
+        pool = await self._db.get_pool()
+        return await pool.fetchval(queries.AVG_CYCLE_TIME)
+
+    async def count_exceptions(self) -> int:
+        pool = await self._db.get_pool()
+        return await pool.fetchval(queries.EXCEPTION_COUNT)
+
+    async def count_temp_failures(self) -> int:
+        pool = await self._db.get_pool()
+        return await pool.fetchval(queries.TEMP_FAIL_COUNT)
+
+    async def count_purity_failures(self) -> int:
+        pool = await self._db.get_pool()
+        return await pool.fetchval(queries.PURITY_FAIL_COUNT)
+
+    async def release_batch(self, batch_id: str, signed_by: str) -> None:
+        pool = await self._db.get_pool()
+        await pool.execute(queries.RELEASE_BATCH, batch_id, signed_by)
+
+    async def reject_batch(self, batch_id: str) -> None:
+        pool = await self._db.get_pool()
+        await pool.execute(queries.REJECT_BATCH, batch_id)
+
+    async def quality_events(self) -> list[dict]:
+        pool = await self._db.get_pool()
+        return [dict(r) for r in await pool.fetch(queries.QUALITY_EVENTS)]
+
+    async def status_breakdown(self) -> list[dict]:
+        pool = await self._db.get_pool()
+        return [dict(r) for r in await pool.fetch(queries.STATUS_BREAKDOWN)]
+
+    async def monthly_trend(self) -> list[dict]:
+        pool = await self._db.get_pool()
+        return [dict(r) for r in await pool.fetch(queries.MONTHLY_TREND)]
+
+    async def cycle_time_by_status(self) -> list[dict]:
+        pool = await self._db.get_pool()
+        return [dict(r) for r in await pool.fetch(queries.CYCLE_TIME_BY_STATUS)]
+
+    async def close(self) -> None:
+        await self._db.close()
+
+
+def create_repository() -> BatchRepository:
+    """
+    Build the backend selected by BATCH_BACKEND.
+
+    "memory" selects the in-process columnar backend loaded with the sample
+    batches from server/seed_data.py (offline dev, tests, benchmarks);
+    anything else uses Lakebase.
+    """
+    if os.environ.get("BATCH_BACKEND", "postgres") == "memory":
+        from .memory_repository import MemoryBatchRepository
+        from .seed_data import seed_rows
+
+        return MemoryBatchRepository(seed_rows())
+    return PostgresBatchRepository()
+
+
+# Built once at import, like db.py's pool, so every request shares one instance.
+repository = create_repository()
+
+
+async def get_repository() -> BatchRepository:
+    """
+    FastAPI dependency returning the process-wide repository.
+
+    Async so FastAPI calls it on the event loop instead of a threadpool. Tests
+    swap backends via app.dependency_overrides[get_repository].
+    """
+    return repository
@@ -0,0 +1,124 @@
+"""API routes against MemoryBatchRepository loaded with server/seed_data.py."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from server.memory_repository import MemoryBatchRepository
+from server.repository import get_repository
+from server.seed_data import seed_rows
+
+
+@pytest.fixture
+def repo():
+    return MemoryBatchRepository(seed_rows())
+
+
+@pytest.fixture
+def client(repo):
+    async def override():
+        return repo
+
+    app.dependency_overrides[get_repository] = override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_kpis(client):
+    assert client.get("/api/kpis").json() == {
+        "pending_count": 15,
+        "avg_cycle_time": 54.7,
+        "total_batches": 25,
+        "released_count": 8,
+        "rejected_count": 2,
+        "exception_count": 10,
+    }
+
+
+def test_reports_summary(client):
+    summary = client.get("/api/reports/summary").json()
+    assert summary["status_breakdown"] == [
+        {"status": "Pending", "count": 15},
+        {"status": "Rejected", "count": 2},
+        {"status": "Released", "count": 8},
+    ]
+    assert summary["monthly_trend"] == [
+        {"month": "2025-11", "total": 5, "released": 3, "pending": 2, "rejected": 0},
+        {"month": "2025-12", "total": 5, "released": 2, "pending": 3, "rejected": 0},
+        {"month": "2026-01", "total": 5, "released": 3, "pending": 2, "rejected": 0},
+        {"month": "2026-02", "total": 10, "released": 0, "pending": 8, "rejected": 2},
+    ]
+    assert summary["exception_rate"] == {
+        "total": 25,
+        "with_exceptions": 10,
+        "rate_pct": 40.0,
+        "temp_fails": 6,
+        "purity_fails": 4,
+    }
+    assert summary["cycle_time_by_status"] == [
+        {"status": "Pending", "avg_cycle": 54.9, "min_cycle": 43.8, "max_cycle": 68.7},
+        {"status": "Rejected", "avg_cycle": 71.8, "min_cycle": 71.5, "max_cycle": 72.1},
+        {"status": "Released", "avg_cycle": 50.1, "min_cycle": 44.6, "max_cycle": 55.2},
+    ]
+
+
+def test_quality_events(client):
+    events = {e["batch_id"]: e for e in client.get("/api/quality-events").json()}
+    assert sorted(events) == [f"BD-0004{n}" for n in range(16, 26)]
+    assert {b for b, e in events.items() if e["severity"] == "Critical"} == {"BD-000418", "BD-000424"}
+    assert events["BD-000416"]["event_type"] == "Temperature Excursion"
+    assert events["BD-000422"]["event_type"] == "Purity Failure"
+
+
+def test_release_batch(client):
+    resp = client.post("/api/batches/BD-000401/release", json={"batch_id": "BD-000401", "signed_by": "J. Doe"})
+    assert resp.status_code == 200
+    batch = client.get("/api/batches/BD-000401").json()
+    assert (batch["status"], batch["signed_by"]) == ("Released", "J. Doe")
+    assert client.get("/api/kpis").json()["released_count"] == 9
+
+    again = client.post("/api/batches/BD-000401/release", json={"batch_id": "BD-000401"})
+    assert again.status_code == 400
+    missing = client.post("/api/batches/BD-999999/release", json={"batch_id": "BD-999999"})
+    assert missing.status_code == 404
+
+
+def test_reject_batch(client):
+    # Prime the cached newest-first order so the reject has to update it in place.
+    assert client.get("/api/batches").json()[0]["batch_id"] != "BD-000404"
+    assert client.post("/api/batches/BD-000404/reject").status_code == 200
+    assert client.get("/api/batches/BD-000404").json()["status"] == "Rejected"
+    assert client.get("/api/batches").json()[0]["batch_id"] == "BD-000404"
+
+    # Only Pending batches can be rejected.
+    client.post("/api/batches/BD-000402/reject")
+    assert client.get("/api/batches/BD-000402").json()["status"] == "Released"
+    assert client.get("/api/kpis").json()["rejected_count"] == 3
+
+
+def test_empty_status_buckets_are_dropped(client, repo):
+    for batch_id in ("BD-000418", "BD-000424"):
+        asyncio.run(repo.release_batch(batch_id, "QA Reviewer"))
+    summary = client.get("/api/reports/summary").json()
+    assert [r["status"] for r in summary["status_breakdown"]] == ["Pending", "Released"]
+    assert [r["status"] for r in summary["cycle_time_by_status"]] == ["Pending", "Released"]
+
+
+@pytest.mark.parametrize(
+    "search, status, expected",
+    [
+        ("BD-0004_1", None, ["BD-000401", "BD-000411", "BD-000421"]),
+        ("%", None, 25),
+        ("STELARA", "Rejected", ["BD-000418", "BD-000424"]),
+        ("42_", "Pending", ["BD-000420", "BD-000421", "BD-000422", "BD-000423", "BD-000425"]),
+        ("4\\_", None, []),
+    ],
+)
+def test_search_follows_ilike(client, search, status, expected):
+    params = {"search": search}
+    if status:
+        params["status"] = status
+    ids = sorted(b["batch_id"] for b in client.get("/api/batches", params=params).json())
+    assert (len(ids) if isinstance(expected, int) else ids) == expected
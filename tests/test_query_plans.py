@@ -0,0 +1,28 @@
+"""Build gate for db_setup/check_query_plans.py.
+
+Runs against the scratch Postgres named by PLAN_CHECK_HOST (plus optional
+PLAN_CHECK_PORT/USER/PASSWORD). Skipped only when PLAN_CHECK_HOST is unset;
+once it is set, connection or auth errors fail the test rather than hiding
+the gate.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+HOST = os.environ.get("PLAN_CHECK_HOST")
+PORT = int(os.environ.get("PLAN_CHECK_PORT", "5432"))
+USER = os.environ.get("PLAN_CHECK_USER", "postgres")
+PASSWORD = os.environ.get("PLAN_CHECK_PASSWORD", "")
+ROWS = int(os.environ.get("PLAN_CHECK_ROWS", "200000"))
+
+
+@pytest.mark.skipif(not HOST, reason="PLAN_CHECK_HOST not set; no Postgres to check plans against")
+def test_query_plans_within_budget():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "db_setup"))
+    import check_query_plans
+
+    failures = check_query_plans.check_plans(HOST, PORT, USER, PASSWORD, "batch_plan_check", ROWS)
+    assert failures == []